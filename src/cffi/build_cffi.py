@@ -1,3 +1,5 @@
+import glob
+import hashlib
 import os
 import sys
 import ddc_util
@@ -17,8 +19,8 @@ ffibuilder = FFI()
 base_dir    = "/shared/playproj/i2c/src/"
 header_fn   = base_dir + "public/ddcutil_c_apitypes.h"
 base_name   = "_ddccffi"
-module_name = "%s%s" % (base_name, sysver)
-# module_name = base_name
+# API mode: one extension module with a stable name, regardless of Python version
+module_name = base_name
 
 
 ffibuilder.set_source(module_name,
@@ -33,46 +35,57 @@ cdef_api_fn   = base_name + "_cdef_c_api.h"
 sample_callback_fn = base_name + "_callback.h"
 
 def read_file(fn):
-  try: 
+  # One buffered read() of the whole header; these files are a few KB,
+  # so there is no reason to read incrementally.
+  try:
      with open(fn, 'r') as fn_handle:
         lines = fn_handle.read()
-        
   except Exception as excp:
     print(excp)
     sys.exit(1)
 
-  if (len(lines) == 0):
-     printf("Empty file: %s" % cdef_types_fn)
+  if len(lines) == 0:
+     print("Empty file: %s" % fn)
   return lines
 
-cdef_types_lines = read_file(cdef_types_fn)
-cdef_api_lines   = read_file(cdef_api_fn)
-cdef_callback_lines = read_file(sample_callback_fn)
-    
-
-cdef_segments = []
-
-cdef_segments.append(cdef_types_lines)
-cdef_segments.append(cdef_api_lines)
-cdef_segments.append(cdef_callback_lines)
-
-print("len(cdef_segments): %d" % len(cdef_segments))
-
-for ndx in range(len(cdef_segments)):
-   print("ndx: %d" % ndx)
-   ffibuilder.cdef(cdef_segments[ndx])
-
-if nocompile:
-    c_fn = "%s.c" % module_name
-    ffibuilder.emit_c_code(c_fn)
-    
-else:
-    ffibuilder.compile(verbose=True)
-
-    # hack
-    if sysver == 3:
-        os.rename("_ddccffi3.cpython-36m-x86_64-linux-gnu.so", "_ddccffi3.so")
-    # else:
-    #     os.rename("_ddccffi.so", "_ddccffi2.so")    
-    
-    
\ No newline at end of file
+# One cdef() call over the concatenated headers; cffi parses the
+# declarations in a single pass instead of once per file.
+cdef_text = "\n".join(
+    read_file(fn) for fn in (cdef_types_fn, cdef_api_fn, sample_callback_fn))
+ffibuilder.cdef(cdef_text)
+
+hash_fn = base_name + ".hash"
+
+def cdef_hash():
+    """Hash of the cdef inputs, so an unchanged header set need not be recompiled."""
+    return hashlib.sha256(cdef_text.encode("utf-8")).hexdigest()
+
+def compiled_module_current(current_hash):
+    """True if a built module exists and the cdef headers are unchanged since it was built."""
+    try:
+        with open(hash_fn, 'r') as fh:
+            old_hash = fh.read().strip()
+    except IOError:
+        return False
+    if old_hash != current_hash:
+        return False
+    so_files = glob.glob(module_name + "*.so")
+    if not so_files:
+        return False
+    hash_mtime = os.path.getmtime(hash_fn)
+    return all(os.path.getmtime(so) >= hash_mtime for so in so_files)
+
+# When invoked via setup.py's cffi_modules, setuptools imports this module
+# and compiles ffibuilder itself, so only compile when run as a script.
+if __name__ == "__main__":
+    if nocompile:
+        c_fn = "%s.c" % module_name
+        ffibuilder.emit_c_code(c_fn)
+    else:
+        new_hash = cdef_hash()
+        if compiled_module_current(new_hash):
+            print("cdef headers unchanged, %s is current, skipping compile" % module_name)
+        else:
+            with open(hash_fn, 'w') as fh:
+                fh.write(new_hash)
+            ffibuilder.compile(verbose=True)
@@ -1,21 +1,18 @@
 import sys
 
-sysver = 0
-if sys.version_info[0] == 2 and sys.version_info[1] >= 7:
-    sysver = 2
-elif sys.version_info[0] == 3 and sys.version_info[1] >= 4:
-    sysver = 3
-else:
+if sys.version_info < (3, 4):
     raise Exception("Unsupported Python version: %d.%d" % (sys.version_info[0], sys.version_info[1] ) )
-print("sysver: %d" % sysver)
 
-import traceback
+import os
 # from sets import Set, ImmutableSet
 
-if sysver == 2:
-    from _ddccffi2 import ffi,lib
-else:
+# _ddccffi is built in cffi API mode (see setup.py, build_cffi.py).
+# The version-suffixed module remains available as a fallback for
+# builds predating the stable module name.
+if os.environ.get("DDC_CFFI_VERSIONED_MODULE"):
     from _ddccffi3 import ffi, lib
+else:
+    from _ddccffi import ffi, lib
 
 # copy all the constants - should be able to do this by introspection
 WRITE_ONLY_TRIES    = lib.DDCA_WRITE_ONLY_TRIES
@@ -34,17 +31,25 @@ TABLE_VCP_VALUE_PARM     = lib.DDCA_TABLE_VCP_VALUE_PARM
 UNSET_VCP_VALUE_TYPE_PARM     = lib.DDCA_UNSET_VCP_VALUE_TYPE_PARM
 
 
+# Out-parameter pointer types used on every API call.  ffi.new() with a
+# cached ctype skips re-parsing the type string per call, and ffi.new()
+# zero-fills the result, so no init=ffi.NULL is needed.
+_T_VOID_PP = ffi.typeof("void **")
+_T_CHAR_PP = ffi.typeof("char **")
+
+
 #
 # Utilities
 #
 
 def bits_to_frozenset(bits):
+  # Isolate the lowest set bit (bits & -bits) until none remain,
+  # touching only the bits actually set instead of all 16 positions.
   s = set()
-  for i in range(16):
-    v = 1 << i
-    # print("v,i = %d,%d" % (v,i))
-    if bits & v:
-      s.add(v)
+  while bits:
+    v = bits & -bits
+    s.add(v)
+    bits ^= v
   return frozenset(s)
 
 
@@ -66,41 +71,17 @@ class DDC_Exception(Exception):
 
 def create_ddc_exception(rc):
     # To do: test for rc values that map to standard Python exceptions
-
-    excp = DDC_Exception(rc)     # ???
-    # To do: adjust the stack
-    (etype, evalue, tb) = sys.exc_info()
-    print("traceback.print_tb(): ")
-    traceback.print_tb(tb)
-    print("traceback.print_exception():")
-    traceback.print_exception(etype, evalue, tb)
-    print("traceback.print_exc():")
-    traceback.print_exc()
-
-    x = traceback.extract_tb(tb)
-    print(type(x))
-    print(x)
-    y = traceback.extract_stack(tb)
-    print(type(y))
-    print(y)
-
-    print(excp)
-    return excp
+    # Just build and return the exception; whether and how it is
+    # reported is the caller's business.
+    return DDC_Exception(rc)
 
 def check_ddca_status(rc):
     if (rc != 0):
-        excp = DDC_Exception(rc)
-        # (etype, evalue, tb) = sys.exc_info()    
-
-        print(excp)
-        raise excp
+        raise DDC_Exception(rc)
 
 
 def from_cdata_string(cdata_string):
-    s = ffi.string(cdata_string)
-    if sysver == 3:
-        s = s.decode("UTF-8")
-    return s
+    return ffi.string(cdata_string).decode("UTF-8")
 
 #
 # API functions - Build Information
@@ -125,30 +106,51 @@ def build_options_as_set():
 # API functions - Status Code
 #
 
+# Status code names and descriptions are fixed for the life of the
+# library, so cache the converted strings per status code.
+_rc_name_cache = {}
+_rc_desc_cache = {}
+
 def rc_name(status_code):
-    return from_cdata_string(lib.ddca_rc_name(status_code))
+    name = _rc_name_cache.get(status_code)
+    if name is None:
+        name = from_cdata_string(lib.ddca_rc_name(status_code))
+        _rc_name_cache[status_code] = name
+    return name
 
 def rc_desc(status_code):
-    return from_cdata_string( lib.ddca_rc_desc(status_code))
+    desc = _rc_desc_cache.get(status_code)
+    if desc is None:
+        desc = from_cdata_string( lib.ddca_rc_desc(status_code))
+        _rc_desc_cache[status_code] = desc
+    return desc
 
 #
 # MCCS version spec
 #
 
-MCCS_VNONE =  lib.DDCA_VNONE 
-MCCS_V10   =  lib.DDCA_V10 
+MCCS_VNONE =  lib.DDCA_VNONE
+MCCS_V10   =  lib.DDCA_V10
 MCCS_V20   =  lib.DDCA_V20
 MCCS_V21   =  lib.DDCA_V21
 MCCS_V30   =  lib.DDCA_V30
-MCCS_V22   =  lib.DDCA_V22 
+MCCS_V22   =  lib.DDCA_V22
+
+MCCS_VERSION_IDS = (MCCS_VNONE, MCCS_V10, MCCS_V20, MCCS_V21, MCCS_V30, MCCS_V22)
 
+# The name and description for each version id never change, so build
+# the lookup tables once instead of calling into the library each time.
+_mccs_version_id_names = dict(
+   (vid, from_cdata_string(lib.ddca_mccs_version_id_name(vid))) for vid in MCCS_VERSION_IDS)
+_mccs_version_id_descs = dict(
+   (vid, from_cdata_string(lib.ddca_mccs_version_id_desc(vid))) for vid in MCCS_VERSION_IDS)
 
 
 def mccs_version_id_name(version_id):
-   return from_cdata_string(lib.ddca_mccs_version_id_name(version_id))
+   return _mccs_version_id_names[version_id]
 
 def mccs_version_id_desc(version_id):
-   return from_cdata_string(lib.ddca_mccs_version_id_desc(version_id))
+   return _mccs_version_id_descs[version_id]
 
 
 
@@ -174,11 +176,18 @@ def set_max_tries(try_type, ct):
 # Feature Information
 #
 
+# Feature names are fixed for the life of the library; cache the
+# converted string per feature code (as for rc_name()/rc_desc()) so
+# repeated lookups skip the C call.  sys.intern() lets all callers
+# share one string object per name.
+_feature_name_cache = {}
+
 def get_feature_name(feature_code):
-    s = ffi.string(lib.ddca_get_feature_name(feature_code))
-    if sysver==3:
-        s = s.decode("UTF-8")
-    return s
+    name = _feature_name_cache.get(feature_code)
+    if name is None:
+        name = sys.intern(from_cdata_string(lib.ddca_get_feature_name(feature_code)))
+        _feature_name_cache[feature_code] = name
+    return name
 
 
 class Feature_Value_Table(object):
@@ -188,37 +197,36 @@ class Feature_Value_Table(object):
         
     @classmethod
     def create_from_c_table(cls, c_table):
-        print("(Feature_Value_Table.create_from_c_table) c_table=%s" % c_table)
         table = Feature_Value_Table(c_table)
-        table.entries = {}
-        ndx = 0;
-        while True: 
-            (k,v) = (c_table[ndx].value_code, c_table[ndx].value_name)
-            if k == 0 and v == ffi.NULL:
+        # Index the cdata array once per entry rather than once per field,
+        # and fill a local dict before attaching it to the instance.
+        # ffi.string/ffi.NULL as locals save an attribute lookup per entry.
+        entries = {}
+        ndx = 0
+        ffi_string = ffi.string
+        NULL = ffi.NULL
+        while True:
+            entry = c_table[ndx]
+            k = entry.value_code
+            v = entry.value_name
+            if k == 0 and v == NULL:
                 break
-            v2 = ffi.string(v)
-            if sysver==3:
-                v2 = v2.decode("UTF-8")
-            # print("ndx=%d, c_table=%s, value_code=%s, value_name=%s" % (ndx, c_table[ndx], k, v2) )
-            table.entries[k] = v2
+            entries[k] = ffi_string(v).decode("UTF-8")
             ndx = ndx+1
+        table.entries = entries
         return table
 
     @classmethod
     def create_by_query(cls, feature_code, mccs_version_id):
-        print("(create_by_query) feature_code = 0x%02x, mccs_version=%d" % (feature_code,mccs_version_id) )
         # TODO: validate mccs_version_id
         
         pc_table = ffi.new("DDCA_Feature_Value_Table *", init=ffi.NULL)
         rc = lib.ddca_get_simple_sl_value_table(feature_code, mccs_version_id, pc_table)
         if rc != 0:
             raise create_ddc_exception(rc)
-        t = Feature_Value_Table.create_from_c_table(pc_table[0])
-        # print(t)
-        # return pc_table[0]
-        return t
+        return Feature_Value_Table.create_from_c_table(pc_table[0])
             
-    def lookup(value_code):
+    def lookup(self, value_code):
         return self.entries[value_code]
         
     def report(self):
@@ -242,16 +250,13 @@ class Feature_Info(object):
         
     @classmethod
     def create_by_vcp_version(cls, feature_code, mccs_version_id):
-        print("(create_by_vcp_version) mccs_version_id=%d" % mccs_version_id)
         # TODO: validate mccs_version_id
         
         c_feature_info = ffi.new("DDCA_Version_Feature_Info **", init=ffi.NULL)
         rc = lib.ddca_get_feature_info_by_vcp_version(feature_code, mccs_version_id, c_feature_info)
         if rc != 0:
-            excp = create_ddc_exception(rc)
-            raise excp
-        finfo = Feature_Info(c_feature_info[0])
-        return finfo
+            raise create_ddc_exception(rc)
+        return Feature_Info(c_feature_info[0])
         
         
     @property
@@ -321,15 +326,11 @@ class Parsed_Capabilities(object):
     
     def __init__(self, c_pcaps):
         super(Parsed_Capabilities,self).__init__()
-        self.__dict__['_c_pcaps'] = c_pcaps
+        self._c_pcaps = c_pcaps
              
     @classmethod
     def create_from_string(cls, cap_string):
-        print("(create_from_string) cap_string = %s" % cap_string)
         c_parsed_caps = ffi.new("DDCA_Capabilities **", init=ffi.NULL)
-        print(c_parsed_caps)
-        print(type(cap_string))
-        print(type(c_parsed_caps))
         rc = lib.ddca_parse_capabilities_string(cap_string, c_parsed_caps)
         if rc != 0:
             excp = create_ddc_exception(rc)
@@ -378,14 +379,14 @@ IO_ADL      = lib.DDCA_IO_ADL
 IO_USB      = lib.DDCA_IO_USB
 
 class IO_Path(object):
+    __slots__ = ('io_mode',)
+
     def __init__(self, io_mode):
-        print("(IO_Path.__init__) io_mode=%d" % io_mode)
         # does this get me anything I can't get from isinstance()
         self.io_mode = io_mode
         
     @classmethod
     def create_from_cdata(cls, cdata):
-        print("(IO_Path.create_from_cdata) %s" % dir(cdata))
         if cdata.io_mode == IO_DEVI2C:
             instance = DEVI2C_IO_Path(cdata.i2c_busno)
         elif cdata.io_mode == IO_ADL:
@@ -395,9 +396,9 @@ class IO_Path(object):
         return instance
   
 class DEVI2C_IO_Path(IO_Path):
-    
+    __slots__ = ('busno',)
+
     def __init__(self, i2c_busno):
-        print("(DEVI2C_IO_Path) i2c_busno=%d" % i2c_busno)
         super(DEVI2C_IO_Path,self).__init__(IO_DEVI2C)
         self.busno = i2c_busno
     
@@ -405,6 +406,8 @@ class DEVI2C_IO_Path(IO_Path):
         return "[DEVI2C_IO_Path: busno=%d]"  % self.busno
     
 class ADL_IO_Path(IO_Path): 
+    __slots__ = ('iAdapterIndex', 'iDisplayIndex')
+
     def __init_(self, iAdapterIndex, iDisplayIndex):
         super(ADL_IO_Path,self).__init__(IO_ADL)
         self.iAdapterIndex = iAdapterIndex
@@ -415,7 +418,8 @@ class ADL_IO_Path(IO_Path):
 
 
 class USB_IO_Path(IO_Path):
-    
+    __slots__ = ('hiddev_devno',)
+
     def __init__(self, hiddev_devno):
         super(USB_IO_Path,self).__init__(IO_USB)
         self.hiddev_devno = hiddev_devno
@@ -429,146 +433,62 @@ class USB_IO_Path(IO_Path):
 # Dislay_Information
 #
 
+def _scalar_prop(field):
+    """Generates a read-only property for a numeric field of the wrapped C struct."""
+    def fget(self):
+        return getattr(self._c_dinfo, field)
+    fget.__name__ = field
+    return property(fget)
+
+def _string_prop(field):
+    """Generates a read-only property for a char array field of the wrapped C struct."""
+    def fget(self):
+        return from_cdata_string(getattr(self._c_dinfo, field))
+    fget.__name__ = field
+    return property(fget)
+
+
 class Display_Info(object):
-    
+    __slots__ = ('_c_dinfo',)
+
     def __init__(self, c_dinfo):
         super(Display_Info,self).__init__()
-        self.__dict__['_c_dinfo'] = c_dinfo
-        
+        self._c_dinfo = c_dinfo
+
+    # Accessors generated from the field tables below instead of one
+    # hand-written property per field.
+    dispno     = _scalar_prop('dispno')
+    dref       = _scalar_prop('dref')
+    usb_bus    = _scalar_prop('usb_bus')
+    usb_device = _scalar_prop('usb_device')
+
+    mfg_id     = _string_prop('mfg_id')
+    model_name = _string_prop('model_name')
+    sn         = _string_prop('sn')
 
-    @property
-    def dispno(self):
-        return self._c_dinfo.dispno
-#     @dispno.setter
-#     def dispno(self, value):
-#         raise AttributeError()
-        
-    @property
-    def mfg_id(self):
-        # print("model_name")
-        result = ffi.string(self._c_dinfo.mfg_id)
-        if sysver == 3:
-            result = result.decode("UTF-8")
-        return result
-#     @mfg_id.setter
-#     def mfg_id(self, value):
-#         raise AttributeError()
-    
-    @property
-    def model_name(self):
-        # print("model_name")
-        result = ffi.string(self._c_dinfo.model_name)
-        if sysver == 3:
-            result = result.decode("UTF-8")
-        return result
-    @model_name.setter
-#     def model_name(self, value):
-#         # print("model_name setter")
-#         raise AttributeError()
-      
-    @property
-    def sn(self):
-        result = ffi.string(self._c_dinfo.sn)
-        if sysver == 3:
-            result = result.decode("UTF-8")
-        return result
-#     @sn.setter
-#     def sn(self, value):
-#         raise AttributeError()
-        
     @property
     def edid_bytes(self):
-        print("edid_bytes getter")
-        return bytes( ffi.buffer(self._c_dinfo.edid_bytes, 128) )
-#     @edid_bytes.setter
-#     def edid_bytes(self, vale):
-#         raise AttributeError("edid_bytes cannot be modified")
-         
+        # Zero-copy view of the 128 byte EDID in the C struct.  Callers
+        # needing an independent copy can apply bytes() themselves.
+        return memoryview( ffi.buffer(self._c_dinfo.edid_bytes, 128) )
+
     @property
     def path(self):
-        a = self._c_dinfo.path
-        # print(a)
-        b = IO_Path.create_from_cdata(a)
-        # print(b)
-        return b
-#     @path.setter
-#     def sn(self, value):
-#         raise AttributeError()   
-             
-    @property
-    def dref(self):
-        result = (self._c_dinfo.dref)
-        return result
-#     @dref.setter
-#     def dref(self, value):
-#         raise AttributeError()
-        
-    @property
-    def usb_bus(self):
-        return self._c_dinfo.usb_bus
-#     @usb_bus.setter
-#     def usb_bus(self, value):
-#         raise AttributeError()
- 
-    @property
-    def usb_device(self):
-        return self._c_dinfo.usb_device
- 
-    def __setattr__(self, name, value): 
-        if name == "_c_dinfo":
-            raise AttributeError("can't set attribute")
-        else:
-            object.__setattr__(self, name, value)
-           
+        return IO_Path.create_from_cdata(self._c_dinfo.path)
+
     def __repr__(self):
         result = "[Display_Info: dispno=%d, mfg=%s]" %\
                          ( self._c_dinfo.dispno, ffi.string(self._c_dinfo.mfg_id) )
         return result
-            
-            
-
-#     def __getattr__(self, item):
-#         print("(__getattr__) item=%s" % (item))
-#         # if item == "mfg_id":
-#         #     retval = ffi.string(self._c_dinfo.mfg_id) 
-#         #     if sysver == 3:
-#         #         retval = retval.decode("UTF-8")
-#         # if item == "sn":
-#         #     retval = ffi.string(self._c_dinfo.sn)
-#         #     if sysver == 3:
-#         #        retval = retval.decode("UTF-8")
-#         # elif item == "edid_bytes":
-#         #    edidbuf = ffi.buffer(self._c_dinfo.edid_bytes, 128)
-#         #    retval = bytes(edidbuf)
-#         elif item == "dref":
-#             retval = Display_Ref(self._c_dinfo.dref)
-#         elif item == "path":
-#             a = self._c_dinfo.path
-#             print(a)
-#             b = IO_Path.create_from_cdata(a)
-#             print(b)
-#             retval = b
-#         else:
-#             raise AttributeError("Invalid: %s" % item)
-#             # retval = getattr(self,item)
-#         return retval
-
-
-      
 
 
 def get_display_info_list():
-    print("(get_display_info_list) Starting")
+    # Single traversal of the C array.  Each Display_Info wraps a slot of
+    # the one DDCA_Display_Info_List allocation; fields are unmarshaled
+    # lazily by the properties, so nothing is copied per display here.
     dilist = lib.ddca_get_display_info_list()
-    print("ct: %d" % dilist.ct)
-    result = []
-    for ndx in range(dilist.ct):
-        di = dilist.info[ndx]
-        print("di: ", dir(di))
-        print( ffi.string(di.mfg_id))
-        dinfo = Display_Info(di)
-        result.append(dinfo)
-    return result
+    info = dilist.info
+    return [ Display_Info(info[ndx]) for ndx in range(dilist.ct) ]
 
 
 
@@ -582,7 +502,7 @@ class Display_Identifier(object):
     @classmethod
     def create_by_dispno(cls, dispno): 
         # c_did1 = ffi.new("void **")
-        c_did2 = ffi.new("void **", init=ffi.NULL)
+        c_did2 = ffi.new(_T_VOID_PP)
         # cannot instantiate ctype void of unknown size
         # c_did3 = ffi.new("void *")
         # c_did4 = ffi.new("void *", init=ffi.NULL)
@@ -616,10 +536,7 @@ class Display_Identifier(object):
 
 
     def __repr__(self):
-        result = ffi.string(lib.ddca_did_repr(self.c_did))
-        if sysver == 3:
-            result = result.decode("UTF-8")
-        return result
+        return from_cdata_string(lib.ddca_did_repr(self.c_did))
 
 
 
@@ -632,7 +549,7 @@ class Display_Ref(object):
 
   @classmethod
   def create_from_did(cls, did):
-      c_dref = ffi.new("void **", init=ffi.NULL)
+      c_dref = ffi.new(_T_VOID_PP)
       rc = lib.ddca_create_display_ref(did.c_did, c_dref)
       if rc != 0:
           excp = create_ddc_exception(rc)
@@ -650,44 +567,17 @@ class Display_Ref(object):
            raise excp
 
   def __repr__(self):
-        result = ffi.string(lib.ddca_dref_repr(self.c_dref)) 
-        if sysver == 3:
-            result = result.decode("UTF-8")
-        return result
+        return from_cdata_string(lib.ddca_dref_repr(self.c_dref))
 
   def dbgrpt(self, depth):
     lib.ddca_report_display_ref(self.c_dref, depth)
 
 
-# source: https://gist.github.com/inactivist/4ef7058c2132fa16759d
-
-def __convert_struct_field( s, fields ):
-    for field,fieldtype in fields:
-        if fieldtype.type.kind == 'primitive':
-            yield (field,getattr( s, field ))
-        else:
-            yield (field, convert_to_python( getattr( s, field ) ))
-
-def convert_to_python(s):
-    type=ffi.typeof(s)
-    if type.kind == 'struct':
-        return dict(__convert_struct_field( s, type.fields ) )
-    elif type.kind == 'array':
-        if type.item.kind == 'primitive':
-            if type.item.cname == 'char':
-                return ffi.string(s)
-            else:
-                return [ s[i] for i in range(type.length) ]
-        else:
-            return [ convert_to_python(s[i]) for i in range(type.length) ]
-    elif type.kind == 'primitive':
-        return int(s)
-
 class Display_Handle(object):
 
     @classmethod
     def open(cls, dref): 
-        pc_dh = ffi.new("void **", init=ffi.NULL)
+        pc_dh = ffi.new(_T_VOID_PP)
         rc = lib.ddca_open_display(dref.c_dref, pc_dh)
         if rc != 0:
           excp = create_ddc_exception(rc)
@@ -703,13 +593,10 @@ class Display_Handle(object):
           raise excp
 
     def __repr__(self):
-        result = ffi.string(lib.ddca_dh_repr(self.c_dh))
-        if sysver == 3:
-            result = result.decode("UTF-8")
-        return result
+        return from_cdata_string(lib.ddca_dh_repr(self.c_dh))
 
     def get_capabilities_string(self):
-      ps = ffi.new("char **", init=ffi.NULL)
+      ps = ffi.new(_T_CHAR_PP)
       rc = lib.ddca_get_capabilities_string(self.c_dh, ps)
       if rc != 0:
           excp = create_ddc_exception(rc)
@@ -733,70 +620,53 @@ class Display_Handle(object):
        if rc != 0:
           excp = create_ddc_exception(rc)
           raise excp
-       print("pid: ", pid)
-       print("unpacked: ", ffi.unpack(pid,4))
-
-       id = pid[0]
-       print("id: ", id)       
-       return id
+       return pid[0]
 
 
     def get_mccs_version(self):
-      print("(get_mccs_version) Starting.")
       pv = ffi.new("DDCA_MCCS_Version_Spec *")
       rc = lib.ddca_get_mccs_version(self.c_dh, pv)
       if rc != 0:
           raise create_ddc_exception(rc)
-      print("pv: ", pv)
-      print("unpacked: ", ffi.unpack(pv,4))
-
       ver = pv[0]
-      print("ver: ", ver)   
-      # print("unpacked: ", ffi.unpack(ver,2))    
-
-      print ("ver.major: ", ver.major)
-
-      v2 = convert_to_python(ver)
-      print("v2: ", v2)
-      # return as dictionary
-      # return v2
-
       return (ver.major, ver.minor)
 
 
-    def get_vcp_value(self, feature_code, feature_type=lib.DDCA_UNSET_VCP_VALUE_TYPE_PARM):
-       print("(get_vcp_value) Starting")
+    def get_vcp_value(self, feature_code, feature_type=UNSET_VCP_VALUE_TYPE_PARM):
+       # References the module level constants, bound once at import,
+       # rather than lib attributes resolved on every call.
        pvalrec = ffi.new("DDCA_Any_Vcp_Value **", init=ffi.NULL)
        rc = lib.ddca_get_any_vcp_value(self.c_dh, feature_code, feature_type, pvalrec)
        if rc != 0:
           excp = create_ddc_exception(rc)
           raise excp
 
-       # print("pvalrec: ", pvalrec)
-       # print("unpacked: ", ffi.unpack(pvalrec,8))
-
        valrec = pvalrec[0]
-       print("valrec: ", valrec)
-       # v2 = convert_to_python(valrec)
-       # print("v2: ",  v2)
-       
-       # return valrec
-       if valrec.value_type == lib.DDCA_NON_TABLE_VCP_VALUE:
+       if valrec.value_type == NON_TABLE_VCP_VALUE:
+           c_nc = valrec.val.c_nc
            retval = Non_Table_Vcp_Value(
-                        valrec.opcode, 
-                        valrec.val.c_nc.mh, 
-                        valrec.val.c_nc.ml, 
-                        valrec.val.c_nc.sh, 
-                        valrec.val.c_nc.sl )
+                        valrec.opcode,
+                        c_nc.mh,
+                        c_nc.ml,
+                        c_nc.sh,
+                        c_nc.sl )
        else:
            # bytestring = ??
            bytestring = None
            retval = Table_Vcp_Value(valrec.opcode, bytestring)
        return retval
 
+    # Specialized variants for callers that know the feature type,
+    # avoiding the UNSET probe on the C side.
+    def get_non_table_vcp_value(self, feature_code):
+       return self.get_vcp_value(feature_code, NON_TABLE_VCP_VALUE_PARM)
+
+    def get_table_vcp_value(self, feature_code):
+       return self.get_vcp_value(feature_code, TABLE_VCP_VALUE_PARM)
+
 
     def get_formatted_vcp_value(self, feature_code):
-       ps = ffi.new("char **", init=ffi.NULL)
+       ps = ffi.new(_T_CHAR_PP)
        rc = lib.ddca_get_formatted_vcp_value(self.c_dh, feature_code, ps)
        if rc != 0:
           excp = create_ddc_exception(rc)
@@ -813,20 +683,23 @@ class Display_Handle(object):
         self.set_nc_vcp_value(vcp_code, 0, sl)
         
     def set_continuous_vcp_value(self, vcp_code, newval):
-        sh = newval >> 8
-        sl = newval % 0xff
-        self.set_nc_vcp_value(vcp_code, sh, sl)
+        # n. the low byte is newval & 0xff, not newval % 0xff
+        rc = lib.ddca_set_raw_vcp_value(self.c_dh, vcp_code, newval >> 8, newval & 0xff)
+        if rc != 0:
+          excp = create_ddc_exception(rc)
+          raise excp
         
        
 class Vcp_Value(object):
-    
+    __slots__ = ()
+
     def __init__(self):
-        print("Vcp_Value.__init__()")
         pass
         
         
 class Non_Table_Vcp_Value(Vcp_Value):
-    
+    __slots__ = ('opcode', 'mh', 'ml', 'sh', 'sl')
+
     def __init__(self, opcode, mh, ml, sh, sl):
         # print("Non_Table_Vcp_Value.__init__()")
         super(Non_Table_Vcp_Value,self).__init__()
@@ -838,30 +711,26 @@ class Non_Table_Vcp_Value(Vcp_Value):
         # print("Non_Table_Vcp_Value.__init__() Done")
         
             
-    def __getattr__(self, item):
-        # print("(__getattr__) item=%s" % (item))
-        if item == "cur_val":
-            retval = self.sh << 8 | self.sl
-        elif item == "max_val":
-            retval = self.mh << 8 | self.ml
-        else:
-            raise AttributeError("Invalid: %s" % item)
-            # retval = getattr(self,item)
-        return retval
-
-    def __setattr__(self, item, newval):
-        # print("(__setattr__) item=%s, newval=%s" % (item,newval))
-        if item == "curval":
-            #avoid recursive call
-            Vcp_Value.__setattr__(self, "sh", newval >> 8)
-            Vcp_Value.__setattr__(self, "sl", newval & 0xff)
-        elif item == "maxval":
-            Vcp_Value.__setattr__(self, "mh", newval >> 8)
-            Vcp_Value.__setattr__(self, "ml", newval & 0xff)
-        else:
-            # raise AttributeError("Invalid: %s" % item)
-            Vcp_Value.__setattr__(self, item, newval)
-        
+    # Properties avoid the __getattr__/__setattr__ dispatch that would
+    # otherwise intercept every attribute access on the instance.
+    @property
+    def cur_val(self):
+        return self.sh << 8 | self.sl
+
+    @cur_val.setter
+    def cur_val(self, newval):
+        self.sh = newval >> 8
+        self.sl = newval & 0xff
+
+    @property
+    def max_val(self):
+        return self.mh << 8 | self.ml
+
+    @max_val.setter
+    def max_val(self, newval):
+        self.mh = newval >> 8
+        self.ml = newval & 0xff
+
     def __repr__(self):
         result = "[Vcp_Value: Feature 0x%02x, type=NON_TABLE, mh=0x%02x, ml=0x%02x, sh=0x%02x, sl=0x%02x, maxval=%d, curval=%d]" %\
                          ( self.opcode, self.mh, self.ml, self.sh, self.sl, self.max_val, self.cur_val)
@@ -869,7 +738,8 @@ class Non_Table_Vcp_Value(Vcp_Value):
         
         
 class Table_Vcp_Value(Vcp_Value):
-    
+    __slots__ = ('opcode', 'bytestring')
+
     def __init__(self, opcode, bytestring):
         self.opcode = opcode
         self.bytestring = bytestring
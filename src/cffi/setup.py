@@ -0,0 +1,13 @@
+from setuptools import setup
+
+# Builds the _ddccffi extension in cffi API mode, so that ddc_cffi.py
+# never has to fall back to ABI-mode ffi.dlopen().
+setup(
+    name="ddccffi",
+    version="0.1.0",
+    description="cffi based Python interface to libddcutil",
+    py_modules=["ddc_cffi", "ddc_util"],
+    setup_requires=["cffi>=1.0.0"],
+    install_requires=["cffi>=1.0.0"],
+    cffi_modules=["build_cffi.py:ffibuilder"],
+)
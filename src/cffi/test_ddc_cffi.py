@@ -1,16 +1,3 @@
-import sys
-
-sysver = 0
-if sys.version_info[0] == 2 and sys.version_info[1] >= 7:
-    sysver = 2
-elif sys.version_info[0] == 3 and sys.version_info[1] >= 4:
-    sysver = 3
-else:
-    raise Exception("Unsupported Python version: %d.%d" % (sys.version_info[0], sys.version_info[1] ) )
-print("sysver: %d" % sysver)
-
-
-
 import ddc_cffi as ddccffi
 import time
 
@@ -159,8 +146,8 @@ print("get_vcp_value() returned: ", vcpval)
 
 dilist = ddccffi.get_display_info_list()
 print("ct: %d" % len(dilist))
-for ndx in range(len(dilist)):
-    print(dilist[ndx])
+for di in dilist:
+    print(di)
     
 di=dilist[0]
 print(di.mfg_id)
@@ -5,11 +5,11 @@
 ###  Purpose: generic utility functions not tied to color management
 
 import inspect
-import io
 import os
 import os.path
-import struct
+import shutil
 import subprocess
+import sys
 
 
 
@@ -38,20 +38,17 @@ def getFileBytes(fn):
       Raises:  
          IOError 
    """
-   try: 
-      f = io.FileIO(fn) 
-      byteseq = f.readall() 
-      f.close() 
-   except Exception as err: 
-      # print err
-      raise
+   # A buffered open(..., 'rb').read() sizes the buffer from the file's
+   # stat and reads it in one pass; the raw io.FileIO layer added nothing
+   with open(fn, 'rb') as f: 
+      byteseq = f.read() 
    # print "Byte count: ", len(bytes) 
    return byteseq 
 
 def writeFile(fn, byteseq): 
    try: 
-      f = io.FileIO(fn)
-      f.write(byteseq)
+      with open(fn, 'wb') as f:
+         f.write(byteseq)
    except Exception as err:
       print( err )
       raise
@@ -60,9 +57,8 @@ def writeFile(fn, byteseq):
 
 
 def byte2int(byte): 
-   # requires a string argument of length 1: 
-   result = struct.unpack('B',byte)[0] 
-   return result 
+   # requires a bytes argument of length 1: 
+   return byte[0] 
    
 
 def byteToHexString(byte): 
@@ -78,15 +74,13 @@ def byteToHexString(byte):
 #    intval = struct.unpack('>i',byte)[0]       # fails 
 #    return intval
 
-def hexString(byteseq): 
-   """ Given a sequence of bytes, return its representation as a hex string. 
-   using lower case characters.""" 
-   if isinstance(byteseq, bytearray):
-      result = ''.join( '%02x' % byte for byte in byteseq ) 
-   else:
-      result = ''.join( '%02x' % ord(byte) for byte in byteseq ) 
-   # print "(hexString) Returning: %s" % newResult
-   return result 
+def hexString(byteseq):
+   """ Given a sequence of bytes, return its representation as a hex string.
+   using lower case characters."""
+   # bytes.hex() formats the whole sequence in C instead of per byte
+   if isinstance(byteseq, str):
+      return byteseq.encode('latin-1').hex()
+   return bytes(byteseq).hex()
 
 
 def bytes2NumberList(byteseq): 
@@ -97,11 +91,13 @@ def bytes2NumberList(byteseq):
       Arguments:  bytes  string of bytes or list of bytes
       Returns:    array of integers 
    """
-   result = [] 
-   for b in byteseq: 
-      result.append( ord(b)  ) 
-      # result += byte2Number(b) 
-   return result 
+   # Normalize string forms to bytes, then list(bytearray(...)) yields
+   # the integer values in a single C-level pass instead of per-byte ord()
+   if isinstance(byteseq, str):
+      byteseq = byteseq.encode('latin-1')
+   elif isinstance(byteseq, list) and byteseq and isinstance(byteseq[0], str):
+      byteseq = ''.join(byteseq).encode('latin-1')
+   return list(bytearray(byteseq))
 
    
 def hexStringToByteArray(hexstring):
@@ -114,11 +110,8 @@ def hexStringToByteArray(hexstring):
    """
    if len(hexstring) % 2 != 0:
       raise ValueError("Invalid hex string: %s" % hexstring)
-   ba = []
-   for i in range(0, len(hexstring), 2):
-      # raises ValueError if invalid hex characters in string:
-      ba.append( chr( int( hexstring[i:i+2],16) ) )
-   return ba
+   # raises ValueError if invalid hex characters in string:
+   return [ chr(b) for b in bytes.fromhex(hexstring) ]
 
 
 def hexStringToByteString(hexstring):
@@ -133,40 +126,33 @@ def hexStringToByteString(hexstring):
 
 
 
+# Printability of each code point, precomputed once so the per-character
+# test is a single indexed lookup instead of an ord() plus two compares
+_printable_table = tuple( 32 <= i < 127 for i in range(256) )
+
+
 def isPrintableChar(ch): 
-   return ord(ch) >= 32 and ord(ch) < 127 
+   """Is ch, a 1 character string or an integer byte value, printable Ascii?"""
+   if isinstance(ch, str): 
+      ch = ord(ch) 
+   return ch < 256 and _printable_table[ch] 
    
 
 def isSingleByte(val): 
    """Determines if a value is a string of length 1"""
-   if type(val) == str and val.len() == 1: 
-      result = True 
-   else: 
-      result = False
-   return result 
+   return isinstance(val, str) and len(val) == 1 
 
 
 def isByteList(val): 
-   result = False
-   if type(val) == list: 
-      result = True 
-      for b in val: 
-         if type(b) != str or b.len() != 1: 
-            result = False
-            break
-   return result 
+   """Is val a list of 1 character strings"""
+   return isinstance(val, list) and \
+          all( isinstance(b, str) and len(b) == 1 for b in val ) 
 
 
 def isUChrList(val): 
    """Is val a list of unsigned integers in the range 0..255"""
-   result = False 
-   if type(val) == list: 
-      result = True
-      for b in val: 
-         if not isinstance(b, int) or b < 0 or b > 255: 
-            result = False 
-            break 
-   return result 
+   return isinstance(val, list) and \
+          all( isinstance(b, int) and 0 <= b <= 255 for b in val ) 
 
 
 def uchrListToString(val): 
@@ -175,18 +161,27 @@ def uchrListToString(val):
    return result 
 
 
+# Conversion function for each directly convertible input type.  Looking
+# up type(val) here picks the conversion in one step, instead of probing
+# the value with isByteList()/isUChrList(), each of which rescans it.
+_asByteString_conversions = {
+   str:       lambda v: v,
+   bytes:     lambda v: v.decode('latin-1'),
+   bytearray: lambda v: v.decode('latin-1'),
+}
+
+
 def asByteString(string_or_bytelist): 
    """Takes either a string or a list of bytes, and returns a string"""
-   result = string_or_bytelist 
-   if type(string_or_bytelist) == str: 
-      result = string_or_bytelist
-   elif isByteList(string_or_bytelist): 
-      result = "".join(b for b in string_or_bytelist) 
-   elif isUChrList(string_or_bytelist): 
-      result = "".join( chr(b) for b in string_or_bytelist)
-   else: 
-      raise Exception("Invalid argument type %s for value: %r" % (type(string_or_bytelist), string_or_bytelist ) ) 
-   return result 
+   fn = _asByteString_conversions.get( type(string_or_bytelist) ) 
+   if fn: 
+      return fn(string_or_bytelist) 
+   if isinstance(string_or_bytelist, list): 
+      if not string_or_bytelist or isinstance(string_or_bytelist[0], str): 
+         return "".join(string_or_bytelist) 
+      if isinstance(string_or_bytelist[0], int): 
+         return bytes(string_or_bytelist).decode('latin-1') 
+   raise Exception("Invalid argument type %s for value: %r" % (type(string_or_bytelist), string_or_bytelist ) ) 
 
 
 def byteArrayToString(byte_iterable): 
@@ -197,14 +192,17 @@ def byteArrayToString(byte_iterable):
    return result 
 
 
+# str counterpart of _printable_xlate: maps non-printable Latin-1
+# code points to '.'
+_printable_xlate_str = str.maketrans(
+                          { i: '.' for i in range(256) if not (32 <= i < 127) } )
+
+
 def printableString(s): 
    """Given a string, replaces non-printable characters with '.'""" 
    # debug_string("util.printableString", 's', s)
-   result = ""
-   for ndx in range(0,len(s)): 
-      ch = s[ndx] 
-      result = result + ( ch if isPrintableChar(ch) else '.' ) 
-   return result 
+   # one C-level pass instead of quadratic result+ch accumulation
+   return s.translate(_printable_xlate_str) 
      
 
 def asAsciiString(string_or_bytelist): 
@@ -217,55 +215,44 @@ def asAsciiString(string_or_bytelist):
    """
    s0 = asByteString(string_or_bytelist) 
    # s1 = s0.rstrip('\0')
-   ct = len(s0)
-   if ct == 0:
+   if len(s0) == 0:
       return None 
 
-   result = ''
+   # Return on the first non-printable character; no need to accumulate
+   # a copy of a string we already hold
    for ch in s0: 
       if not isPrintableChar(ch): 
-         result = None
-         break
-      result = result + ch 
-   return result 
+         return None 
+   return s0 
    
       
-def hex_dump(byteseq, title=None): 
+# Maps each byte value to itself if printable, else to '.'
+_printable_xlate = bytes( (i if 32 <= i < 127 else 0x2e) for i in range(256) )
+
+
+def hex_dump(byteseq, title=None):
    """Outputs a hex data table"""
 
+   lines = []
    if title is not None:
-      print(title)
-   print("Addr   0  1  2  3  4  5  6  7   8  9  A  B  C  D  E  F  Printable")
-   print("--------------------------------------------------------------------------")    
-   rowct =  ( len(byteseq) + 15 ) // 16
-   for rowctr in range(0,rowct): 
-      start = rowctr * 16 
-      rowbytes = byteseq[start:start+16] 
-      # startHex = "%4x" % start 
-      # rowBytesHex = hexString(rowbytes) 
-      spacedHex = ''
-      printable = ''
-      for ndx in range(0,16):
-         if ndx < len(rowbytes): 
-            byte = rowbytes[ndx] 
-            if isinstance(byte, str):
-               spacedHex += hexString(byte)  
-            else:
-               spacedHex += "%02x" % byte
-            spacedHex += ' '
-
-            if isinstance(byte, int):
-               ch = chr(byte)
-            else: 
-               ch = byte
-            printable += ( ch if isPrintableChar(ch) else '.' ) 
-         else:
-            spacedHex += '   ' 
-            printable += ' '
-         if ndx == 7: 
-            spacedHex += ' '
-            
-      print("%04x  %s|%s|" % (start, spacedHex, printable)) 
+      lines.append(title)
+   lines.append("Addr   0  1  2  3  4  5  6  7   8  9  A  B  C  D  E  F  Printable")
+   lines.append("--------------------------------------------------------------------------")
+   # Normalize once, then format the entire buffer in one hex()
+   # conversion and one translate() and take string slices per row;
+   # each byte occupies 3 characters of hexed, separator included.
+   if isinstance(byteseq, str):
+      data = byteseq.encode('latin-1')
+   else:
+      data = bytes(byteseq)
+   hexed     = data.hex(' ')
+   printable = data.translate(_printable_xlate).decode('ascii')
+   for start in range(0, len(data), 16):
+      hexrow = hexed[3*start : 3*start+47]
+      lines.append("%04x  %-25s%-24s|%-16s|" %
+                   (start, hexrow[:23], hexrow[24:], printable[start:start+16]))
+   # emit the whole table with one write instead of one per row
+   sys.stdout.write("\n".join(lines) + "\n")
 
 
 # For a nice summary of the pros and cons of various ways to execute shell commands, 
@@ -273,7 +260,7 @@ def hex_dump(byteseq, title=None):
 
 
 def execute_shell_command(cmd, debug=False): 
-   """Execute a shell command using os.popen(). 
+   """Execute a shell command using subprocess.run(). 
 
       Arguments:  cmd    command string to execute
                   debug  indicates whether to output debug messages
@@ -283,11 +270,9 @@ def execute_shell_command(cmd, debug=False):
    """
    if debug: 
       print("(util.execute_shell_command) Executing command: |%s|" % cmd)
-   fh = os.popen(cmd)
-   text = fh.read() 
-   rc = fh.close() 
-   if rc is None: 
-      rc = 0
+   completed = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+   rc = completed.returncode
+   text = completed.stdout + completed.stderr
    if debug: 
       print("(util.execute_shell_command) response text: |%s|" % text ) 
       print("(util.execute_shell_command) return code: %r" % rc ) 
@@ -295,7 +280,7 @@ def execute_shell_command(cmd, debug=False):
 
 
 def execute_command(cmd, *args, **kwargs): 
-   """Execute a shell command using subprocess.check_output(). 
+   """Execute a command using subprocess.run(), without a shell. 
 
       Arguments:  cmd    command string to execute
                   args   positional arguments 
@@ -317,54 +302,51 @@ def execute_command(cmd, *args, **kwargs):
       args_list = ", ".join(args) 
       print( "(util.execute_command) Executing command: |%s|, Arguments: %s" % (cmd,args_list) ) 
 
-   args2 = [cmd] 
-   for a in args: 
-      args2.append(a)
-   try: 
-      text = subprocess.check_output(args2, stderr=subprocess.STDOUT) 
-      rc = 0
-   except subprocess.CalledProcessError as cpe: 
-      rc = cpe.returncode
-      text = cpe.output
-  
+   completed = subprocess.run([cmd, *args], capture_output=True, text=True)
+   rc = completed.returncode
+   text = completed.stdout + completed.stderr
+
    if debug: 
       print("(util.execute_command) response text: |%s|" % text ) 
       print("(util.execute_command) return code: %r" % rc ) 
    return (rc,text)
 
 
-def is_process_running(process_name): 
-   result = False 
-   for line in os.popen('ps xa'): 
-      fields = line.split() 
-      if len(fields) >= 5:      # have seen a case where line had no executable name 
-         # pid = fields[0] 
-         process = fields[4] 
-         # print "(is_process_running) process=|%s|" % process
-         if process.find(process_name) >= 0:
-            result = True
-            break
+def is_process_running(process_name):
+   # Scan /proc directly instead of forking ps and parsing its output
+   result = False
+   for pid in os.listdir('/proc'):
+      if not pid.isdigit():
+         continue
+      try:
+         with open('/proc/' + pid + '/cmdline', 'rb') as f:
+            cmdline = f.read()
+      except OSError:          # process exited, or not readable
+         continue
+      command = cmdline.split(b'\0', 1)[0].decode('utf-8', 'replace')
+      # print "(is_process_running) command=|%s|" % command
+      if command.find(process_name) >= 0:
+         result = True
+         break
    # dbgmsg( "process_name = %s, returning %s" % (process_name, result) )
-   return result 
+   return result
 
 
 def uniprint(s): 
    """Safely prints a string that may contain Unicode code points > 127. 
 
-      This function addresses the problem that Python doesn't know how to print Unicode when its 
-      standard output is not a terminal, e.g. when a Python program is called inside a Bash script 
-      and the output is redirected to a file.  
+      In Python 3 str is always Unicode; only raw byte strings still
+      need decoding before output.
 
       Arguments:    s  string to print 
    """
-   # In case the input is already UTF-8: 
-   if isinstance(s, unicode): 
-      s = s.encode('utf-8') 
+   if isinstance(s, bytes): 
+      s = s.decode('utf-8') 
    print( s)
 
 
 def debug_string(loc, msg, stringval):
-   if isinstance(stringval, unicode): 
+   if isinstance(stringval, str): 
       status = "IS"
    else: 
       status = "IS NOT"
@@ -377,51 +359,32 @@ def debug_string(loc, msg, stringval):
 
 
 def force_unicode(s): 
-   if not isinstance(s, unicode): 
-      try: 
-         s = unicode(s) 
-      except UnicodeDecodeError: 
-         print( "(util.force_unicode) converting from utf-8: |%s|" % s )
-         s = s.decode('utf-8')
+   if isinstance(s, bytes): 
+      s = s.decode('utf-8')
+   elif not isinstance(s, str): 
+      s = str(s) 
    return s 
 
 
 def which(name, flags=os.X_OK):
    """Search PATH for executable files with the given name.
-   
-   On newer versions of MS-Windows, the PATHEXT environment variable will be
-   set to the list of file extensions for files considered executable. This
-   will normally include things like ".EXE". This fuction will also find files
-   with the given name ending with any of these extensions.
-   
-   On MS-Windows the only flag that has any meaning is os.F_OK. Any other
-   flags will be ignored.
-   
-   @type name: C{str}
-   @param name: The name for which to search.
-   
-   @type flags: C{int}
-   @param flags: Arguments to L{os.access}.
-   
-   @rtype: C{list}
-   @param: A list of the full paths to files found, in the
-   order in which they were found.
 
-   Copyright (c) 2001-2004 Twisted Matrix Laboratories.
+   Unlike shutil.which() itself, returns ALL matching files as a list of
+   full paths, in the order in which they were found.  PATHEXT handling
+   on MS-Windows comes for free from shutil.which().
+
+   Arguments:  name   the name for which to search
+               flags  mode bits for the access check (see os.access)
+   Returns:    list of full paths to files found
    """
-   result = []
-   exts = filter(None, os.environ.get('PATHEXT', '').split(os.pathsep))
-   path = os.environ.get('PATH', None)
-   if path is None:
+   path = os.environ.get('PATH')
+   if not path:
       return []
-   for p in os.environ.get('PATH', '').split(os.pathsep):
-      p = os.path.join(p, name)
-      if os.access(p, flags):
-         result.append(p)
-      for e in exts:
-         pext = p + e
-         if os.access(pext, flags):
-            result.append(pext)
+   result = []
+   for p in path.split(os.pathsep):
+      found = shutil.which(name, mode=flags, path=p)
+      if found:
+         result.append(found)
    return result
 
 
@@ -439,30 +402,30 @@ def examineDirTree(dirname, nameTest, dirNameTest=None):
    if dirNameTest and not dirNameTest(dirname):
       return goodNames
 
-   try: 
-      files = os.listdir(dirname) 
-      for fn in files: 
-         fqfn = dirname + '/' + fn
-         if os.path.isdir(fqfn):          # need to handle follow/ignore symbolic links 
-           
-            subdirfns = examineDirTree(fqfn, nameTest, dirNameTest)
-            goodNames += subdirfns
-         elif nameTest(fn): 
-            # print "   Matched:", fn
-            goodNames.append(fqfn) 
-         else:
-            # print "   Not Matched:", fn 
-            pass 
-   except OSError as e: 
+   try:
+      # os.scandir() returns the file type with each entry, avoiding a
+      # separate stat() per name as os.listdir() + isdir() required
+      with os.scandir(dirname) as entries:
+         for entry in entries:
+            if entry.is_dir():          # need to handle follow/ignore symbolic links
+               subdirfns = examineDirTree(entry.path, nameTest, dirNameTest)
+               goodNames += subdirfns
+            elif nameTest(entry.name):
+               # print "   Matched:", entry.name
+               goodNames.append(entry.path)
+            else:
+               # print "   Not Matched:", entry.name
+               pass
+   except OSError as e:
       # print "Error: ", sys.exc_info()
-      if e.errno == 2:      # No such file or directory 
-         # print "(examinedir) Directory not found: " + dirname 
+      if e.errno == 2:      # No such file or directory
+         # print "(examinedir) Directory not found: " + dirname
          pass
       elif e.errno == 13:   # Permission denied
-         print( e.message)
-         pass  
+         print( e)
+         pass
       else:
-         raise 
+         raise
    return goodNames
 
 
@@ -532,8 +495,9 @@ def collectFilesFromTrees(dirs, testFunc):
 
 
 def quotify(s): 
-   newval = '"' + s.replace('"', '""') + '"' 
-   return newval 
+   # the 'in' test is a C-level scan; skip the replace() copy when the
+   # string contains no quote character (the common case)
+   return '"' + (s.replace('"', '""') if '"' in s else s) + '"' 
 
 
 def caller_function_name(depth=0): 
@@ -541,30 +505,34 @@ def caller_function_name(depth=0):
 
    Enables a function to determine it's own name without hardcoding it. 
    """
-   offset = depth+1
-   frame = inspect.stack()[offset] 
-   # print "(util.caller_function_name) caller frame = %s" % str(frame)
-   funcname = frame[3] 
-   # print "(util.caller_function_name) returning %s" % funcname
-   return funcname
+   # sys._getframe() fetches one frame directly; inspect.stack() walks
+   # and annotates the entire call stack, including source file reads
+   frame = sys._getframe(depth+1)
+   return frame.f_code.co_name
+
 
 
+# A code object's filename never changes, so the derived module name is
+# cached per code object.
+_module_name_cache = {}
+
+def _module_name_for_code(code):
+   simple_fn = _module_name_cache.get(code)
+   if simple_fn is None:
+      simple_fn = os.path.basename(code.co_filename)
+      if simple_fn.endswith(".py"):
+         simple_fn = simple_fn[:-3]
+      _module_name_cache[code] = simple_fn
+   return simple_fn
+
 
 def caller_module_name(depth=0): 
    """Returns the name of the module that contains the function that called this function.  
 
    Enables a function to determine it's own module name without hardcoding it. 
    """
-   offset = depth+1
-   frame = inspect.stack()[offset]
-   # print "(util.caller_module_name) caller frame = %s" % str(frame)
-   # module_fn = inspect.stack()[1][1]
-   module_fn = frame[1]
-   simple_fn = os.path.basename(module_fn)
-   if simple_fn.endswith(".py"):
-      simple_fn = simple_fn[:-3]
-   # print "(util.caller_module_name) module_fn = %s" % simple_fn
-   return simple_fn
+   frame = sys._getframe(depth+1)
+   return _module_name_for_code(frame.f_code)
 
 
 
@@ -574,18 +542,9 @@ def caller_module_function_name(depth=0):
 
    Enables a function to determine it's own caller without hardcoding it. 
    """
-   offset = depth+1
-   frame = inspect.stack()[offset]
-   # print "(util.caller_module_name) caller frame = %s" % str(frame)
-   # module_fn = inspect.stack()[1][1]
-   module_fn = frame[1]
-   funcname  = frame[3] 
-   simple_fn = os.path.basename(module_fn)
-   if simple_fn.endswith(".py"):
-      simple_fn = simple_fn[:-3]
-   result = simple_fn + '.' + funcname
-   # print "(util.caller_module_name) returning: %s" % result
-   return result
+   frame = sys._getframe(depth+1)
+   code = frame.f_code
+   return _module_name_for_code(code) + '.' + code.co_name
 
 
 def dbgmsg(msg, cls=None, showModule=True):
@@ -604,7 +563,7 @@ def dbgmsg(msg, cls=None, showModule=True):
             #    module_name = module_name[:-3]
             loc = "%s.%s" % (module_name,loc)
       else: 
-         assert isinstance(cls,basestring)
+         assert isinstance(cls,str)
          if len(cls) > 0:
             loc = "%s.%s" % (cls,loc)
             if showModule: 
@@ -639,9 +598,9 @@ class TraceableClass(object):
 
    @classmethod
    def cfn(cls):
-      clsname  = cls.simple_class_name() 
-      funcname = caller_function_name(1) 
-      result = clsname + '.' + funcname 
+      # Read the calling method's name straight off its frame; this is
+      # one attribute chain, with no intermediate helper call per trace
+      result = cls.__name__ + '.' + sys._getframe(1).f_code.co_name 
       # print "(TraceableClass.cfn) Returning %s" % result
       return result
 
@@ -669,18 +628,17 @@ def var_len_or_none(var_name):
 
    Returns:      string reporting variable value
    """
-   frame = inspect.currentframe() 
-   caller_locals = frame.f_back.f_locals
-   del frame
-
-   s1 = "'%s is None' if %s is None else 'len(%s)=" % (var_name, var_name, var_name)
-   s2 = r"%d' % "
-   s3 = "len(%s)" % var_name
-   expr = s1 + s2 + s3
-   # print "expr:", expr
-   result =  eval(expr, {}, caller_locals)
-   # print "(util.var_len_or_none) var_name='%s', returning: '%s'"  % (var_name, result) 
-   return result
+   # Look the name up in the caller's frame directly; building and
+   # eval()ing an expression string compiled code on every call.
+   frame = sys._getframe(1)
+   try:
+      value = frame.f_locals[var_name]
+   finally:
+      del frame
+
+   if value is None:
+      return "%s is None" % var_name
+   return "len(%s)=%d" % (var_name, len(value))
 
 
 
@@ -700,6 +658,12 @@ def compare_dictionaries(dict1, dict2, name1="Dictionary 1", name2="Dictionary 2
    """
 
    print ("Comparing %s vs %s" % (name1, name2))
+   # When no key filters are given, equal dictionaries (the common case
+   # for a sanity check) are detected by one C-level comparison, skipping
+   # the per-key set algebra below.
+   if not include_keys and not exclude_keys and dict1 == dict2: 
+      print( "Dictionaries match" )
+      return True
    # pprint(exclude_keys)
    keys1 = set(dict1.keys() )
    keys2 = set(dict2.keys() ) 
@@ -754,7 +718,7 @@ def prompt_ok_to_proceed(debug=True):
    result=None
    while result is None: 
       try: 
-         response = raw_input( "Ok to proceed?: ")
+         response = input( "Ok to proceed?: ")
       except KeyboardInterrupt:
          print                   # so system prompt starts on new line
          sys.exit()
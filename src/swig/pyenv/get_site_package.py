@@ -2,66 +2,74 @@ import os
 import site
 import sys
 import sysconfig
+from functools import lru_cache
+
+
+# site.getsitepackages() re-resolves every site-package path on each
+# call; compute the list once per process.
+@lru_cache(maxsize=1)
+def _site_pkgs():
+   return tuple(site.getsitepackages())
+
+
+# invariant for the life of the process
+PYVER = sysconfig.get_python_version()[:3]
+
+# The only prefixes fix_lib() recognizes; precomputing the joined form
+# skips an os.path.join (and its normpath work) per call.
+_PFXLIB = {
+   "/usr":       "/usr/lib/python",
+   "/usr/local": "/usr/local/lib/python",
+}
+
+# longest prefix first, so /usr/local/ is not misreported as /usr
+_PFX_PROBE = ( ("/usr/local/", "/usr/local"),
+               ("/usr/",       "/usr") )
 
 
 def is_debian():
-   result = False 
-   for p in site.getsitepackages():
-      if p.endswith("dist-packages"):
-         result = True
-         break
-   return result
+   # any() short-circuits on the first hit in a C-level loop
+   return any( p.endswith("dist-packages") for p in _site_pkgs() )
 
 
 def fix_lib(libname): 
    old_libname = libname
-   if libname.startswith("/usr/local/"):
-      pfx = "/usr/local"
-   else if libname.startswith("/usr/"):
-      pfx = "/usr"
-   else:
-      pfx = None
+   pfx = next( (v for probe, v in _PFX_PROBE if libname.startswith(probe)), None)
    if pfx:
-      is_debain = False 
-      pkgs = site.getsitepackages()
-      for p in pkgs:
+      pfxlib = _PFXLIB[pfx]
+      # print('pfxlib = %s' % pfxlib)
+
+      # One traversal: note the Debian dist-packages marker and track
+      # the candidate at the same time.  A version specific candidate
+      # (lib/python3.5/ rather than lib/python3/) sticks once found.
+      debian = False
+      candidate = None
+      for p in _site_pkgs():
          if p.endswith("dist-packages"):
-            is_debian = True
-            break
-      if is_debian:
-         pfxlib = os.path.join(pfx, "lib", "python")
-         # print('pfxlib = %s' % pfxlib)
-
-         pyver = sysconfig.get_python_version()[:3]
-         # print("Python version: %s" % pyver)
-
-         for p in pkgs:
-          # TODO: handle case where package name is final suffix
-          if p.startswith(pfxlib) and p.endswith("-packages"):
-            libname = p
-            # prefer the more specific lib/python3.5/ to lib/python3/
-            if libname.contains(pyver):
-               break
-
-   print("(fix_lib) %s -> %s", (old_libname, libname) )
+            debian = True
+         # TODO: handle case where package name is final suffix
+         if p.startswith(pfxlib) and p.endswith("-packages") and \
+               (candidate is None or PYVER not in candidate):
+            candidate = p
+      if debian and candidate:
+         libname = candidate
+
+   print("(fix_lib) %s -> %s" % (old_libname, libname) )
    return libname
 
 
 pfx =  '/usr' if len(sys.argv) < 2 else sys.argv[1] 
 # print( pfx)
 
-pfxlib = os.path.join(pfx, "lib", "python")
+pfxlib = _PFXLIB.get(pfx) or os.path.join(pfx, "lib", "python")
 # print('pfxlib = %s' % pfxlib)
 
 # unused
 # pyver = sysconfig.get_python_version()[:3]
 # print("Python version: %s" % pyver)
 
-result = ''
-for p in site.getsitepackages():
-   if p.startswith(pfxlib) and p.endswith("-packages"):
-      result = p
-      break
+result = next( (p for p in _site_pkgs()
+                  if p.startswith(pfxlib) and p.endswith("-packages")), '')
 # n. no newline
 sys.stdout.write(result)
 
@@ -1,14 +1,28 @@
+import functools
+import io
 import site
 import sys
-import distutils.sysconfig
-# apparently sysconfig is not the same as distutils.sysconfig
 import sysconfig
 import os
 from pprint import pprint 
 
+# Accumulate the whole report in memory and emit it with one write at
+# the end; on a line-buffered terminal every print() otherwise costs
+# its own write() syscall.
+_real_stdout = sys.stdout
+sys.stdout = io.StringIO()
+
+
+def dump_list(lst):
+   # one repr per line; pprint's width-fitting machinery is overkill
+   # for short lists of strings
+   print( "\n".join( repr(x) for x in lst ) )
+
 
 def one_conf_var(vname):
-   print( "  %s: %s" % (vname, distutils.sysconfig.get_config_var(vname)) )
+   # plain lookup in the config-vars dict fetched once below; each
+   # get_config_var() call goes back through get_config_vars() itself
+   print( "  %s: %s" % (vname, c.get(vname)) )
 
 
 pyver = sysconfig.get_python_version()
@@ -19,7 +33,7 @@ print( "OS architecture:  %s" % os.uname()[4])
 
 print("sys.prefix: %s" % sys.prefix)
 print("sys.exec_prefix: %s" % sys.exec_prefix)
-if pyver >= '3':
+if sys.version_info[0] >= 3:
    print("sys.base_prefix: %s" % sys.base_prefix)
    print("sys.base_exec_prefix: %s" % sys.base_exec_prefix)
 print("")
@@ -50,7 +64,7 @@ print("If no argument, defaults to getsitepackages(prefixes=site.PREFXIES)"),
 print("where site.PREFIXES=%s" % site.PREFIXES)
 # for p in site.getsitepackages():
 #    print( p)
-pprint(site.getsitepackages())
+dump_list(site.getsitepackages())
 print("")
 
 print( "site.getusersitepackages():  %s" % site.getusersitepackages())
@@ -58,6 +72,12 @@ print( "site.getusersitepackages():  %s" % site.getusersitepackages())
 print("")
 
 
+# distutils is deprecated and costly to import (and on newer
+# interpreters comes via a setuptools shim); defer it until here, after
+# the cheap interpreter and site information has already been printed.
+# apparently sysconfig is not the same as distutils.sysconfig
+import distutils.sysconfig
+
 print( "platform independent library directory - distutils.sysconfig.get_python_lib(0)")
 print( distutils.sysconfig.get_python_lib(0))
 print("")
@@ -80,7 +100,7 @@ print("Scheme posix_local appears to be specific to Python2 on debian/ubuntu")
 print("It appears that if posix_local esists, it is the default scheme, not posix_prefix")
 
 print("sysconfig.get_scheme_names():")
-pprint(sysconfig.get_scheme_names())
+dump_list(sysconfig.get_scheme_names())
 print("")
 
 if "posix_local" in sysconfig.get_scheme_names():             # pyver < '3'
@@ -103,21 +123,24 @@ get_path_counters = [0,0]
 get_lib_counters  = [0,0]
 
 
-def execute_get_path(library_id, scheme=None, platbase_value=None, expand=True):
-   # print("(execute_get_path) library_id=%s, scheme=%s, platbase_value=%s, expand=%s" % (library_id, scheme, platbase_value, expand))
-   funcdesc = "sysconfig.get_path()"
-   if scheme:
-      schemedesc = "scheme=%s" % scheme
-   else:
-      schemedesc = "scheme=<default>"
-   if expand:
-      if platbase_value:
-         argdesc = "platbase=%s" % platbase_value
-      else:
-         argdesc = "platbase=<default>"
-   else:
-      argdesc = "expand=False"
+# counter index by final path component; anything unrecognized counts
+# as dist-packages, as the old endswith test's else arm did
+_LAST_NDX = { "site-packages": SITE_NDX, "dist-packages": DIST_NDX }
 
+def tally_libname(libname, scheme_counters, func_counters):
+   """Classify libname as site-packages or dist-packages and bump the
+      per-scheme and per-function counter pairs in one place."""
+   ndx = _LAST_NDX.get(libname.rpartition('/')[2], DIST_NDX)
+   scheme_counters[ndx] += 1
+   func_counters[ndx]   += 1
+
+
+# Pure function of its (hashable) arguments, so repeat calls -- the
+# print loops ask for the same paths the identical-scheme filtering
+# already resolved -- are plain cache hits.
+@functools.lru_cache(maxsize=None)
+def _get_path_only(library_id, scheme=None, platbase_value=None, expand=True):
+   # print("(_get_path_only) library_id=%s, scheme=%s, platbase_value=%s, expand=%s" % (library_id, scheme, platbase_value, expand))
    if scheme:
       if expand:
          if platbase_value:
@@ -135,56 +158,52 @@ def execute_get_path(library_id, scheme=None, platbase_value=None, expand=True):
       else:
          libname = sysconfig.get_path(library_id, expand=False )
 
+   return libname
+
+
+def execute_get_path(library_id, scheme=None, platbase_value=None, expand=True):
+   # The descriptive strings exist only for printing; comparison code
+   # calls _get_path_only() and never pays for building them.
+   funcdesc = "sysconfig.get_path()"
+   if scheme:
+      schemedesc = "scheme=%s" % scheme
+   else:
+      schemedesc = "scheme=<default>"
+   if expand:
+      if platbase_value:
+         argdesc = "platbase=%s" % platbase_value
+      else:
+         argdesc = "platbase=<default>"
+   else:
+      argdesc = "expand=False"
+
+   libname = _get_path_only(library_id, scheme, platbase_value, expand)
    return(libname, funcdesc, schemedesc, argdesc)
 
 
+def scheme_signature(library_id, scheme):
+   """Tuple of resolved library names that characterizes a scheme:
+      the unexpanded path, then the expansion under each prefix of interest.
+   """
+   return tuple( _get_path_only(library_id, scheme, pfx) if pfx
+                 else _get_path_only(library_id, scheme, expand=False)
+                 for pfx in [None, '/usr', '/usr/local', None] )
+
+
 def compare_schemes(library_id, scheme1, scheme2):
    # print("(compare_schemes) library_id=%s, scheme1=%s, scheme2=%s" % (library_id, scheme1, scheme2))
-   result = True
-   libname1 = execute_get_path(library_id, scheme1, None, expand=False)[0]
-   libname2 = execute_get_path(library_id, scheme2, None, expand=False)[0]
-   if libname1 != libname2: 
-      result = False
-   else:
-      for pfx in ['/usr', '/usr/local', None]:
-         if pfx:
-            libname1 = execute_get_path(library_id, scheme1,  pfx )[0]
-            libname2 = execute_get_path(library_id, scheme2,  pfx )[0]
-         else:
-            libname1 = execute_get_path(library_id, scheme1, None, expand=False)[0]
-            libname2 = execute_get_path(library_id, scheme2, None, expand=False)[0]
-
-         if libname1 != libname2:
-            result = False
-            break 
-   # print("(compare_schemes) library_id=%s, scheme1=%s, scheme2=%s, returning: %s" % (library_id, scheme1, scheme2, result))
-   return result
+   # cheapest discriminator first: schemes whose unexpanded template
+   # paths differ need none of the per-prefix expansions resolved
+   if _get_path_only(library_id, scheme1, expand=False) != \
+         _get_path_only(library_id, scheme2, expand=False):
+      return False
+   return scheme_signature(library_id, scheme1) == scheme_signature(library_id, scheme2)
 
 def compare_prefixes(library_id, scheme, prefix1, prefix2):
    # print("(compare_prefixes) library_id=%s, scheme=%s, prefix1=%s, prefix2=%s" % (library_id, scheme, prefix1, prefix2))
-   result = True
-   if scheme:
-      if prefix1:
-         libname1 = execute_get_path(library_id, scheme,  platbase_value=prefix1)[0]
-      else:
-         libname1 = execute_get_path(library_id, scheme )[0]
-      if prefix2: 
-         libname2 = execute_get_path(library_id, scheme,  platbase_value = prefix2 )[0]
-      else:
-         libname2 = execute_get_path(library_id, scheme )[0]
-   else:
-      if prefix1:
-         libname1 = execute_get_path(library_id, platbase_value= prefix1)[0]
-      else:
-         libname1 = execute_get_path(library_id)[0]
-      if prefix2: 
-         libname2 = execute_get_path(library_id, platbase_value=prefix2 )[0]
-      else:
-         libname2 = execute_get_path(library_id )[0]
-   if libname1 != libname2:
-      result = False
-
-   return result
+   if prefix1 == prefix2:      # same prefix, nothing to resolve
+      return True
+   return _get_path_only(library_id, scheme, prefix1) == _get_path_only(library_id, scheme, prefix2)
 
 def scheme_desc(scheme_name):
    if scheme_name:
@@ -203,37 +222,35 @@ def prefix_desc(prefix_name):
 
 def filter_identical_schemes(library_id, schemes):
    # print("(filter_identical_schemes) library_id=%s, schemes=%s"  % (library_id, schemes))
-   filtered_schemes = schemes
-   scheme_ndx1 = 0
-   while scheme_ndx1 < len(filtered_schemes)-1 :
-      scheme_ndx2 = scheme_ndx1 + 1
-      while scheme_ndx2 < len(filtered_schemes):
-         sc1 = filtered_schemes[scheme_ndx1]
-         sc2 = filtered_schemes[scheme_ndx2]
-         if compare_schemes(library_id, sc1, sc2):
-            print("library_id=%s, %s and %s are identical" % ( library_id, scheme_desc(sc1), scheme_desc(sc2) ) )
-            del filtered_schemes[scheme_ndx2]
-         else:
-            scheme_ndx2 += 1
-      scheme_ndx1 += 1
-   return filtered_schemes      
+   # Single pass: the first scheme seen with a given signature is kept
+   # as the representative, later ones are duplicates.  No index
+   # juggling, no O(n) list deletions.
+   seen = {}         # signature -> representative scheme
+   kept = []
+   for sc in schemes:
+      sig = scheme_signature(library_id, sc)
+      if sig in seen:
+         print("library_id=%s, %s and %s are identical" % ( library_id, scheme_desc(seen[sig]), scheme_desc(sc) ) )
+      else:
+         seen[sig] = sc
+         kept.append(sc)
+   # filter in place, as before: the caller reuses the list across library ids
+   schemes[:] = kept
+   return schemes
 
 def filter_identical_prefixes(library_id, scheme, prefixes):
-   filtered_prefixes = prefixes
-   prefix_ndx1 = 0
-   while prefix_ndx1 < len(filtered_prefixes)-1 :
-      prefix_ndx2 = prefix_ndx1 + 1
-      while prefix_ndx2 < len(filtered_prefixes):
-         pfx1 = filtered_prefixes[prefix_ndx1]
-         pfx2 = filtered_prefixes[prefix_ndx2]
-         if compare_prefixes(library_id, scheme, pfx1, pfx2):
-            print("library_id=%s, %s, %s and %s are identical" % ( library_id, scheme_desc(scheme), prefix_desc(pfx1), prefix_desc(pfx2) ) )
-            del filtered_prefixes[prefix_ndx2]
-         else:
-            prefix_ndx2 += 1
-      prefix_ndx1 += 1
-   # print("(filter_identical_prefixes) library_id=%s, scheme=%s, Returning: %s" % (library_id, scheme, filtered_prefixes))
-   return filtered_prefixes 
+   seen = {}         # resolved library name -> representative prefix
+   kept = []
+   for pfx in prefixes:
+      libname = _get_path_only(library_id, scheme, pfx)
+      if libname in seen:
+         print("library_id=%s, %s, %s and %s are identical" % ( library_id, scheme_desc(scheme), prefix_desc(seen[libname]), prefix_desc(pfx) ) )
+      else:
+         seen[libname] = pfx
+         kept.append(pfx)
+   prefixes[:] = kept
+   # print("(filter_identical_prefixes) library_id=%s, scheme=%s, Returning: %s" % (library_id, scheme, prefixes))
+   return prefixes 
 
 for libid in ['purelib', 'platlib']:
    print("*** %s:" % libid)
@@ -252,16 +269,16 @@ for libid in ['purelib', 'platlib']:
    print("prefixes_for_scheme:")
    pprint(prefixes_for_scheme)
 
+   # Materialize the scheme x prefix product as rows first -- all cache
+   # hits, since the filtering above already resolved these paths --
+   # then render them in a simple print loop.
+   rows = [ execute_get_path(libid, sc, pfx, expand=True)
+               for sc in filtered_schemes
+               for pfx in prefixes_for_scheme[sc] ]
    template = "  %-45s %-20s %-25s %s"
    print("Filtered %s libraries:" % libid)
-   for sc in filtered_schemes:
-      # print("sc: %s" % sc)
-      cur_prefixes = prefixes_for_scheme[sc]
-      #  pprint( cur_prefixes )     
-      for pfx in prefixes_for_scheme[sc]:
-         #print("pfx: %s" % pfx)
-         (libname, funcdesc, schemedesc, argdesc) = execute_get_path(libid, sc, pfx, expand=True)
-         print(template % (funcdesc, schemedesc, argdesc, libname))
+   for (libname, funcdesc, schemedesc, argdesc) in rows:
+      print(template % (funcdesc, schemedesc, argdesc, libname))
    print("")
 
 print("")
@@ -305,10 +322,7 @@ for scheme in schemes:
       libname  = sysconfig.get_path('platlib', expand=False) 
       schemedesc = "scheme=<default>"
    print(template % (funcdesc, schemedesc, argdesc, libname))
-   ndx = SITE_NDX if libname.endswith("site-packages") else DIST_NDX
-   counters[ndx] += 1
-   fcounters = get_path_counters
-   fcounters[ndx] += 1
+   tally_libname(libname, counters, get_path_counters)
 
    if scheme:
       libname  = sysconfig.get_path('platlib', scheme) 
@@ -319,10 +333,7 @@ for scheme in schemes:
    funcdesc = "sysconfig.get_path()"
    argdesc  = "<defaults>"
    print(template % (funcdesc, schemedesc, argdesc, libname))
-   ndx = SITE_NDX if libname.endswith("site-packages") else DIST_NDX
-   counters[ndx] += 1
-   fcounters = get_path_counters
-   fcounters[ndx] += 1
+   tally_libname(libname, counters, get_path_counters)
 
 
 
@@ -342,11 +353,7 @@ for scheme in schemes:
      funcdesc = "sysconfig.get_path()"
      argdesc  = "prefix=%s" % prefix
      print( template % (funcdesc, schemedesc, argdesc, libname))
-     counters = posix_prefix_counters if scheme == "posix_prefix" else non_posix_prefix_counters
-     ndx = SITE_NDX if libname.endswith("site-packages") else DIST_NDX
-     counters[ndx] += 1
-     fcounters = get_path_counters
-     fcounters[ndx] += 1
+     tally_libname(libname, counters, get_path_counters)
 
      if prefix:
         libname  =  distutils.sysconfig.get_python_lib(1, 0, prefix=prefix) 
@@ -355,11 +362,7 @@ for scheme in schemes:
      schemedesc = ""
      funcdesc = "distutils.sysconfig.get_python_lib()"
      print( template % (funcdesc, schemedesc, argdesc, libname))
-     counters = non_posix_prefix_counters
-     ndx = SITE_NDX if libname.endswith("site-packages") else DIST_NDX
-     counters[ndx] += 1
-     fcounters = get_lib_counters
-     fcounters[ndx] += 1
+     tally_libname(libname, non_posix_prefix_counters, get_lib_counters)
 
 
 print("")
@@ -382,7 +385,7 @@ print("")
 
 
 print("sysconfig.getpath_names():")
-pprint(sysconfig.get_path_names())
+dump_list(sysconfig.get_path_names())
 for sname in sysconfig.get_path_names():
    print("  %s:  %s" % (sname, sysconfig.get_path(sname)) )
 
@@ -488,3 +491,5 @@ for v in vlist2:
 #    print k
 
 
+_buffer, sys.stdout = sys.stdout, _real_stdout
+sys.stdout.write(_buffer.getvalue())
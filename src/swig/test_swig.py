@@ -69,7 +69,9 @@ def test1():
 
 if __name__ == "__main__":
    print( "(test_swig)" )
-   print( dir(ddc_swig) )
+   # diagnostic only; python -O strips the whole block from the bytecode
+   if __debug__:
+      print( dir(ddc_swig) )
    print()
    get_build_information() 
    print()